@@ -8,13 +8,21 @@ Safeshell acts as the safety layer, allowing safe commands and blocking dangerou
 
 import asyncio
 from dataclasses import dataclass
+from pathlib import Path
 
-from safeshell import Sandbox
+from safeshell import BaseSandbox, Sandbox
+
+WORKSPACE = Path("./workspace").resolve()
+
+# Upper bound on read-only actions executed at the same time.
+MAX_CONCURRENT = 4
 
 @dataclass
 class AgentAction:
     thought: str
     command: str
+    parallelizable: bool = False
+    """True if the action only reads state and may run alongside its neighbours."""
 
 class MockLLM:
     """Simulates an LLM acting on a user request."""
@@ -28,7 +36,13 @@ class MockLLM:
             # Innocent exploration
             AgentAction(
                 thought="I need to see what files are here.",
-                command="ls -la"
+                command="ls -la",
+                parallelizable=True,
+            ),
+            AgentAction(
+                thought="And check which Python I have.",
+                command="python3 --version",
+                parallelizable=True,
             ),
             # Doing work (safe)
             AgentAction(
@@ -38,7 +52,13 @@ class MockLLM:
             # Returns results (safe)
             AgentAction(
                 thought="Let me run the script.",
-                command="python3 hello.py"
+                command="python3 hello.py",
+                parallelizable=True,
+            ),
+            AgentAction(
+                thought="I'll double-check what I wrote.",
+                command="cat hello.py",
+                parallelizable=True,
             ),
             # HALLUCINATION / MISTAKE (Dangerous!)
             # The agent gets confused and tries to modify system files
@@ -60,21 +80,35 @@ class MockLLM:
         return None
 
 
-async def run_shell_tool(command: str) -> str:
+async def run_shell_tool(sb: BaseSandbox, command: str) -> str:
     """
     The tool exposed to the Agent.
     Wraps Safeshell to ensure the agent can't destroy the machine.
     """
     print(f"  [Tool] Executing: {command}")
 
-    # Auto-detects Docker → Seatbelt → Landlock
-    async with Sandbox("./workspace") as sb:
-        result = await sb.execute(command)
+    result = await sb.execute(command)
 
-        if result.exit_code == 0:
-            return f"Success:\n{result.stdout}"
-        else:
-            return f"Error ({result.exit_code}):\n{result.stderr}"
+    if result.exit_code == 0:
+        return f"Success:\n{result.stdout}"
+    else:
+        return f"Error ({result.exit_code}):\n{result.stderr}"
+
+
+async def run_batch(sb: BaseSandbox, batch: list[AgentAction]) -> list[str]:
+    """
+    Run a batch of actions against the shared sandbox.
+    Read-only batches run concurrently; anything else is a single action.
+    """
+    limit = asyncio.Semaphore(MAX_CONCURRENT)
+
+    async def run_one(action: AgentAction) -> str:
+        async with limit:
+            return await run_shell_tool(sb, action.command)
+
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(run_one(action)) for action in batch]
+    return [task.result() for task in tasks]
 
 
 async def main():
@@ -84,26 +118,36 @@ async def main():
     llm = MockLLM()
 
     # Create a workspace for the agent
-    from pathlib import Path
-    Path("./workspace").mkdir(parents=True, exist_ok=True)
+    WORKSPACE.mkdir(parents=True, exist_ok=True)
 
-    while True:
+    # One sandbox for the whole session: isolation setup is paid once,
+    # not once per action.
+    async with Sandbox(str(WORKSPACE)) as sb:
         action = llm.next_action()
-        if not action:
-            print("✅ Agent finished task.")
-            break
-
-        print(f"🤖 Thought: {action.thought}")
-
-        # EXECUTE UNTRUSTED CODE HERE
-        output = await run_shell_tool(action.command)
-
-        # Check protection
-        if "Operation not permitted" in output or "denied" in output or "Blocked" in output:
-             print(f"🛡️ SAFESHELL PROTECTED SYSTEM: {output.strip().splitlines()[0]}...")
-        else:
-             print(f"  -> Result: {output.strip().splitlines()[0]}...")
-        print("-" * 50)
+        while action:
+            # Group consecutive read-only actions; everything else runs alone
+            # so later steps observe its side effects.
+            batch = [action]
+            action = llm.next_action()
+            while batch[0].parallelizable and action and action.parallelizable:
+                batch.append(action)
+                action = llm.next_action()
+
+            for step in batch:
+                print(f"🤖 Thought: {step.thought}")
+
+            # EXECUTE UNTRUSTED CODE HERE
+            outputs = await run_batch(sb, batch)
+
+            for output in outputs:
+                # Check protection
+                if "Operation not permitted" in output or "denied" in output or "Blocked" in output:
+                     print(f"🛡️ SAFESHELL PROTECTED SYSTEM: {output.strip().splitlines()[0]}...")
+                else:
+                     print(f"  -> Result: {output.strip().splitlines()[0]}...")
+            print("-" * 50)
+
+        print("✅ Agent finished task.")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -14,12 +14,20 @@ def Sandbox(
     network: NetworkMode = NetworkMode.BLOCKED,
     allowlist: NetworkAllowlist | None = None,
     timeout: float = 30.0,
+    max_output_bytes: int | None = None,
 ) -> BaseSandbox:
     """
     Create a sandbox instance.
     Uses NativeSandbox (Seatbelt on macOS, Landlock on Linux).
+    `max_output_bytes` caps what is kept of each of stdout and stderr.
     """
-    return NativeSandbox(cwd, timeout=timeout, network=network, allowlist=allowlist)
+    return NativeSandbox(
+        cwd,
+        timeout=timeout,
+        network=network,
+        allowlist=allowlist,
+        max_output_bytes=max_output_bytes,
+    )
 
 __all__ = [
     "BaseSandbox",
@@ -6,6 +6,8 @@ Provides a ShellTool that wraps the Sandbox for safe execution.
 
 from __future__ import annotations
 
+import asyncio
+import threading
 from typing import Any
 
 try:
@@ -19,6 +21,27 @@ except ImportError:
 
 from safeshell import NetworkAllowlist, NetworkMode, Sandbox
 
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the event loop that backs synchronous tool calls.
+
+    The loop runs forever on a daemon thread and is started on first use,
+    so repeated sync calls reuse it instead of building a loop per call.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="safeshell-langchain", daemon=True
+            ).start()
+            _loop = loop
+    return _loop
+
 
 class ShellToolInput(BaseModel):
     """Input for ShellTool."""
@@ -57,12 +80,15 @@ class ShellTool(BaseTool):
     )
     timeout: float = Field(default=30.0, description="Command timeout in seconds")
 
-    def _run(self, command: str, run_manager: Any = None) -> str:
-        """Synchronous run - not supported for async sandbox."""
-        raise NotImplementedError(
-            "ShellTool only supports async execution. "
-            "Use `await tool.arun(command)` instead."
-        )
+    def _run(self, command: str, _run_manager: Any = None) -> str:
+        """
+        Execute the command synchronously.
+
+        Dispatches to the shared background event loop, so this is safe to
+        call from threads that already run their own loop.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._arun(command), _get_loop())
+        return future.result()
 
     async def _arun(self, command: str, _run_manager: Any = None) -> str:
         """
@@ -6,30 +6,34 @@ Provides helpers to create PydanticAI-compatible tools.
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+import weakref
 from collections.abc import Callable
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-try:
-    import pydantic_ai  # type: ignore # noqa: F401
-except ImportError:
+# Only check that the package is installed; RunContext is needed for type
+# checking alone, so there is no reason to pay for importing pydantic_ai.
+if importlib.util.find_spec("pydantic_ai") is None:
     raise ImportError(
         "PydanticAI integration requires 'pydantic-ai'. "
         "Install with `pip install safeshell[pydantic-ai]`"
-    ) from None
+    )
 
-from typing import TYPE_CHECKING
-
-from safeshell import NetworkAllowlist, NetworkMode, Sandbox
+from safeshell import ConfigurationError, NetworkAllowlist, NetworkMode, Sandbox
 
 if TYPE_CHECKING:
     from pydantic_ai import RunContext
 
+    from safeshell import BaseSandbox
+
 
 def create_shell_tool(
     cwd: str = ".",
     network: NetworkMode = NetworkMode.BLOCKED,
     allowlist: NetworkAllowlist | None = None,
     timeout: float = 30.0,
+    pool_size: int = 4,
 ) -> Callable[..., Any]:
     """
     Create a PydanticAI tool function for safe shell execution.
@@ -37,12 +41,32 @@ def create_shell_tool(
     Returns a function decorated with @tool (implicitly or explicitly handled by PydanticAI)
     that can be registered with an Agent.
 
+    Sandboxes are kept warm in a per-tool pool and reused across calls; at most
+    `pool_size` commands run at once, further calls wait for a free sandbox.
+
     Example:
         >>> from pydantic_ai import Agent
         >>> shell_tool = create_shell_tool("./project")
         >>> agent = Agent("openai:gpt-4", tools=[shell_tool])
     """
 
+    if pool_size < 1:
+        raise ConfigurationError("pool_size must be at least 1.")
+
+    # Idle sandboxes are shared across event loops; only the gate bounding
+    # concurrent calls is loop-bound, so one is created per running loop.
+    idle: list[BaseSandbox] = []
+    gates: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def gate() -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = gates.get(loop)
+        if sem is None:
+            sem = gates[loop] = asyncio.Semaphore(pool_size)
+        return sem
+
     async def shell_tool(
         _ctx: RunContext,
         command: str,
@@ -51,16 +75,17 @@ def create_shell_tool(
         Execute a shell command safely.
         Only allowed operations will succeed.
         """
-        async with Sandbox(
-            cwd=cwd,
-            network=network,
-            allowlist=allowlist,
-        ) as sandbox:
-            result = await sandbox.execute(command, timeout=timeout)
+        async with gate():
+            # Reuse an idle sandbox, creating one lazily while under the pool size.
+            sandbox = idle.pop() if idle else Sandbox(cwd=cwd, network=network, allowlist=allowlist)
+            try:
+                result = await sandbox.execute(command, timeout=timeout)
+            finally:
+                idle.append(sandbox)
 
-            if result.exit_code != 0:
-                return f"Error (Exit Code {result.exit_code}):\n{result.stderr}"
+        if result.exit_code != 0:
+            return f"Error (Exit Code {result.exit_code}):\n{result.stderr}"
 
-            return result.stdout
+        return result.stdout
 
     return shell_tool
@@ -6,9 +6,11 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import errno
 import logging
+import os
 import socket
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
 import h11
 
@@ -19,6 +21,64 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# os.splice() only exists on Linux; elsewhere tunnels copy through a buffer.
+_HAS_SPLICE = hasattr(os, "splice")
+_SPLICE_FLAGS = getattr(os, "SPLICE_F_MOVE", 0) | getattr(os, "SPLICE_F_NONBLOCK", 0)
+
+# Bytes moved per call, matching the default Linux pipe capacity.
+_CHUNK_SIZE = 65536
+
+# Seconds a client gets to send the full request head.
+_HEAD_TIMEOUT = 10.0
+
+
+def _take_socket(reader: StreamReader, writer: StreamWriter) -> tuple[socket.socket, bytes]:
+    """
+    Stop a stream from reading and return a duplicate of its socket, along
+    with any bytes the StreamReader had already buffered.
+
+    The transport keeps the original socket and closes it as usual.
+    """
+    cast("asyncio.Transport", writer.transport).pause_reading()
+    buffer: bytearray = reader._buffer  # type: ignore[attr-defined]
+    pending = bytes(buffer)
+    buffer.clear()
+
+    sock = socket.socket(fileno=os.dup(writer.get_extra_info("socket").fileno()))
+    sock.setblocking(False)
+    return sock, pending
+
+
+async def _wait_fd(loop: asyncio.AbstractEventLoop, fd: int, *, write: bool) -> None:
+    """Wait until fd is readable, or writable if `write` is set."""
+    waiter = loop.create_future()
+
+    def wake() -> None:
+        if not waiter.done():
+            waiter.set_result(None)
+
+    if write:
+        loop.add_writer(fd, wake)
+    else:
+        loop.add_reader(fd, wake)
+    try:
+        await waiter
+    finally:
+        if write:
+            loop.remove_writer(fd)
+        else:
+            loop.remove_reader(fd)
+
+
+async def _copy(loop: asyncio.AbstractEventLoop, src: socket.socket, dst: socket.socket) -> None:
+    """
+    Copy from src to dst through userspace until EOF.
+    A single preallocated buffer is reused, so no bytes object is built per chunk.
+    """
+    buf = memoryview(bytearray(_CHUNK_SIZE))
+    while n := await loop.sock_recv_into(src, buf):
+        await loop.sock_sendall(dst, buf[:n])
+
 
 class AllowlistProxy:
     """
@@ -27,8 +87,10 @@ class AllowlistProxy:
 
     def __init__(self, allowlist: NetworkAllowlist):
         self.allowlist = allowlist
+        self._matcher = allowlist.compile()
         self._server: asyncio.AbstractServer | None = None
         self._port: int = 0
+        self._pipes: list[tuple[int, int]] = []
 
     async def start(self) -> int:
         """Start the proxy server and return the listening port."""
@@ -53,31 +115,33 @@ class AllowlistProxy:
             await self._server.wait_closed()
             self._server = None
 
+        while self._pipes:
+            for fd in self._pipes.pop():
+                os.close(fd)
+
     async def _handle_client(self, reader: StreamReader, writer: StreamWriter) -> None:
         """Handle an incoming client connection."""
         try:
             conn = h11.Connection(our_role=h11.SERVER)
 
-            while True:
-                data = await reader.read(4096)
-                conn.receive_data(data)
-
-                event = conn.next_event()
-                if event is h11.NEED_DATA:
-                    if not data:
-                        break
-                    continue
-
-                elif isinstance(event, h11.Request):
-                    await self._process_request(conn, event, reader, writer)
-                    break
-
-                elif isinstance(event, h11.ConnectionClosed):
-                    return
+            # Feed h11 until it has the whole request head. Bytes the client
+            # sent after the head stay in conn.trailing_data for the tunnel.
+            try:
+                async with asyncio.timeout(_HEAD_TIMEOUT):
+                    event = conn.next_event()
+                    while event is h11.NEED_DATA:
+                        conn.receive_data(await reader.read(4096))
+                        event = conn.next_event()
+            except TimeoutError:
+                return
+            except h11.RemoteProtocolError:
+                await self._send_error(conn, writer, 400, "Bad Request")
+                return
 
-                else:
-                    await self._send_error(conn, writer, 400, "Bad Request")
-                    return
+            if isinstance(event, h11.Request):
+                await self._process_request(conn, event, reader, writer)
+            elif not isinstance(event, h11.ConnectionClosed):
+                await self._send_error(conn, writer, 400, "Bad Request")
 
         except Exception:
             pass  # Connection errors are expected in a proxy
@@ -105,15 +169,18 @@ class AllowlistProxy:
                 await self._send_error(conn, writer, 400, "Invalid Target")
                 return
 
-            if self.allowlist.is_allowed(host, port):
+            if self._matcher.is_allowed(host, port):
                 # Accept tunnel
                 res = h11.Response(status_code=200, reason=b"Connection Established", headers=[])
                 writer.write(conn.send(res))
-                writer.write(conn.send(h11.EndOfMessage()))
                 await writer.drain()
 
+                # h11 has now switched protocols; anything the client sent
+                # after the request head already belongs to the tunnel.
+                initial, _ = conn.trailing_data
+
                 # Switch to bi-directional tunneling
-                await self._tunnel(reader, writer, host, port)
+                await self._tunnel(reader, writer, host, port, initial)
             else:
                 await self._send_error(conn, writer, 403, "Forbidden by Sandbox")
 
@@ -123,8 +190,9 @@ class AllowlistProxy:
 
     async def _send_error(self, conn: h11.Connection, writer: StreamWriter, code: int, msg: str) -> None:
         res = h11.Response(status_code=code, reason=msg.encode(), headers=[])
-        writer.write(conn.send(res))
-        writer.write(conn.send(h11.EndOfMessage()))
+        # One write: the transport sends immediately when its buffer is empty,
+        # so separate writes for head and terminator cost a syscall each.
+        writer.write(conn.send(res) + conn.send(h11.EndOfMessage()))
         await writer.drain()
 
     async def _tunnel(
@@ -132,32 +200,93 @@ class AllowlistProxy:
         client_reader: StreamReader,
         client_writer: StreamWriter,
         remote_host: str,
-        remote_port: int
+        remote_port: int,
+        initial: bytes = b"",
     ) -> None:
         """Bidirectional data piping between client and remote."""
         try:
             remote_reader, remote_writer = await asyncio.open_connection(remote_host, remote_port)
-
-            # Pipe data in both directions concurrently
-            await asyncio.gather(
-                self._pipe(client_reader, remote_writer),
-                self._pipe(remote_reader, client_writer),
-                return_exceptions=True
-            )
         except Exception:
-            pass
+            return
 
-    async def _pipe(self, reader: StreamReader, writer: StreamWriter) -> None:
-        """Transfer data from reader to writer until EOF."""
         try:
-            while True:
-                data = await reader.read(4096)
-                if not data:
-                    break
-                writer.write(data)
-                await writer.drain()
+            # Own each duplicate as soon as it exists, so a failure taking the
+            # remote socket still closes the client one.
+            client_sock, client_pending = _take_socket(client_reader, client_writer)
+            with client_sock:
+                remote_sock, remote_pending = _take_socket(remote_reader, remote_writer)
+                with remote_sock:
+                    # Pipe data in both directions concurrently. A clean EOF ends
+                    # only its own direction; if one side fails, the TaskGroup
+                    # cancels the other instead of leaving it waiting.
+                    async with asyncio.TaskGroup() as tg:
+                        tg.create_task(self._pipe(client_sock, remote_sock, initial + client_pending))
+                        tg.create_task(self._pipe(remote_sock, client_sock, remote_pending))
         except Exception:
-            pass
+            pass  # Includes the ExceptionGroup from a failed direction
         finally:
             with contextlib.suppress(Exception):
-                writer.close()
+                remote_writer.close()
+
+    async def _pipe(self, src: socket.socket, dst: socket.socket, pending: bytes) -> None:
+        """
+        Transfer data from src to dst until EOF, then pass the EOF on.
+
+        Only dst's write side is shut down, so the opposite direction keeps
+        flowing until it reaches its own EOF (TCP half-close).
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            if pending:
+                await loop.sock_sendall(dst, pending)
+            if not (_HAS_SPLICE and await self._splice(loop, src, dst)):
+                await _copy(loop, src, dst)
+        finally:
+            with contextlib.suppress(OSError):
+                dst.shutdown(socket.SHUT_WR)
+
+    async def _splice(
+        self, loop: asyncio.AbstractEventLoop, src: socket.socket, dst: socket.socket
+    ) -> bool:
+        """
+        Transfer data from src to dst until EOF without copying it into userspace.
+
+        Bytes move socket -> pipe -> socket with os.splice(). Pipes are pooled
+        per proxy and reused once fully drained. Returns False, having moved
+        nothing, if the descriptors do not support splicing.
+        """
+        pipe = self._pipes.pop() if self._pipes else os.pipe()
+        pipe_r, pipe_w = pipe
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+        drained = True
+
+        try:
+            while True:
+                try:
+                    n = os.splice(src_fd, pipe_w, _CHUNK_SIZE, flags=_SPLICE_FLAGS)
+                except BlockingIOError:
+                    await _wait_fd(loop, src_fd, write=False)
+                    continue
+                if not n:
+                    return True
+
+                drained = False
+                while n:
+                    try:
+                        n -= os.splice(pipe_r, dst_fd, n, flags=_SPLICE_FLAGS)
+                    except BlockingIOError:
+                        await _wait_fd(loop, dst_fd, write=True)
+                drained = True
+
+        except OSError as e:
+            # EINVAL means a descriptor does not support splicing at all
+            if e.errno != errno.EINVAL or not drained:
+                raise
+            return False
+
+        finally:
+            if drained and self._server is not None:
+                self._pipes.append(pipe)
+            else:
+                os.close(pipe_r)
+                os.close(pipe_w)
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import logging
 import os
 import platform
@@ -16,7 +17,7 @@ from subprocess import PIPE
 import psutil  # type: ignore
 
 from safeshell.core import BaseSandbox
-from safeshell.errors import ExecutionError
+from safeshell.errors import ConfigurationError, ExecutionError
 from safeshell.networking import AllowlistProxy
 from safeshell.sandbox.landlock import build_isolated_command as build_landlock
 from safeshell.sandbox.landlock import supports_namespaces
@@ -26,6 +27,32 @@ from safeshell.types import CommandResult, NetworkAllowlist, NetworkMode
 
 logger = logging.getLogger(__name__)
 
+# Bytes requested per read from a child's stdout/stderr pipe.
+_READ_CHUNK_SIZE = 65536
+
+# Output larger than this is decoded in a worker thread; below it, the
+# thread hand-off costs more than the decode.
+_THREAD_DECODE_THRESHOLD = 64 * 1024
+
+
+def _utf8_boundary(data: bytearray, n: int) -> int:
+    """
+    Move the cut point `n` back so that data[:n] does not end inside a UTF-8
+    sequence. Requires n < len(data); at most three bytes are examined.
+    """
+    stop = max(n - 3, 0)
+    # 0b10xxxxxx marks a continuation byte, i.e. the middle of a character
+    while n > stop and data[n] & 0xC0 == 0x80:
+        n -= 1
+    return n
+
+
+async def _decode(data: bytes) -> str:
+    """Decode command output, moving large outputs off the event loop."""
+    if len(data) > _THREAD_DECODE_THRESHOLD:
+        return await asyncio.to_thread(data.decode, "utf-8", "replace")
+    return data.decode("utf-8", "replace")
+
 
 class KernelIsolation(Enum):
     """Available kernel isolation mechanisms."""
@@ -35,8 +62,14 @@ class KernelIsolation(Enum):
     LANDLOCK = auto()
 
 
+@functools.cache
 def _detect_kernel_isolation() -> KernelIsolation:
-    """Detect available kernel isolation mechanism."""
+    """
+    Detect available kernel isolation mechanism.
+
+    Cached for the life of the process: probing spawns `unshare` on Linux,
+    and the answer cannot change between sandboxes.
+    """
     sys = platform.system()
     if sys == "Darwin":
         if shutil.which("sandbox-exec"):
@@ -63,13 +96,19 @@ class NativeSandbox(BaseSandbox):
         timeout: float = 30.0,
         network: NetworkMode = NetworkMode.BLOCKED,
         allowlist: NetworkAllowlist | None = None,
+        max_output_bytes: int | None = None,
     ):
         super().__init__(cwd=cwd, timeout=timeout)
+        if max_output_bytes is not None and max_output_bytes < 0:
+            raise ConfigurationError("max_output_bytes must be non-negative.")
+
         self.network = network
         self.allowlist = allowlist
+        self.max_output_bytes = max_output_bytes
         self._mechanism = _detect_kernel_isolation()
         self._proxy: AllowlistProxy | None = None
         self._proxy_port: int = 0
+        self._prefixes: dict[bool, list[str]] = {}
 
     def _kill_process_tree(self, pid: int) -> None:
         """Kill process and its children using psutil (synchronous)."""
@@ -102,7 +141,9 @@ class NativeSandbox(BaseSandbox):
             raise ExecutionError("Sandbox is closed.")
 
         timeout_val = timeout if timeout is not None else self.timeout
-        env = os.environ.copy()
+        # None inherits the current environment without copying it; only
+        # proxied runs need an overlay.
+        env: dict[str, str] | None = None
 
         # Build Command
         cmd_list = self._build_command(command)
@@ -116,14 +157,13 @@ class NativeSandbox(BaseSandbox):
             try:
                 self._proxy_port = await local_proxy.start()
                 proxy_url = f"http://127.0.0.1:{self._proxy_port}"
-                env.update(
-                    {
-                        "HTTP_PROXY": proxy_url,
-                        "HTTPS_PROXY": proxy_url,
-                        "http_proxy": proxy_url,
-                        "https_proxy": proxy_url,
-                    }
-                )
+                env = {
+                    **os.environ,
+                    "HTTP_PROXY": proxy_url,
+                    "HTTPS_PROXY": proxy_url,
+                    "http_proxy": proxy_url,
+                    "https_proxy": proxy_url,
+                }
             except Exception as e:
                 raise ExecutionError(f"Failed to start proxy: {e}") from e
 
@@ -139,20 +179,29 @@ class NativeSandbox(BaseSandbox):
 
             try:
                 async with asyncio.timeout(timeout_val):
-                    stdout, stderr = await proc.communicate()
+                    (stdout, out_cut), (stderr, err_cut) = await asyncio.gather(
+                        self._read_output(proc.stdout),
+                        self._read_output(proc.stderr),
+                    )
+                    await proc.wait()
 
+                stdout_text, stderr_text = await asyncio.gather(_decode(stdout), _decode(stderr))
                 return CommandResult(
-                    stdout=stdout.decode(errors="replace"),
-                    stderr=stderr.decode(errors="replace"),
+                    stdout=stdout_text,
+                    stderr=stderr_text,
                     exit_code=proc.returncode or 0,
+                    truncated=out_cut or err_cut,
                 )
 
             except TimeoutError:
+                # psutil waits up to 3s for the tree to exit; keep that off the
+                # event loop so proxies and other sandboxes stay responsive.
                 if proc.pid:
-                    self._kill_process_tree(proc.pid)
+                    await asyncio.to_thread(self._kill_process_tree, proc.pid)
 
+                # Reap the child, but never hang on one that ignores SIGKILL
                 with contextlib.suppress(Exception):
-                    await proc.wait()
+                    await asyncio.wait_for(proc.wait(), 2.0)
 
                 return CommandResult(
                     stdout="", stderr="Command timed out.", exit_code=-1, timed_out=True
@@ -167,17 +216,57 @@ class NativeSandbox(BaseSandbox):
                 if self._proxy == local_proxy:
                     self._proxy = None
 
+    async def _read_output(self, stream: asyncio.StreamReader | None) -> tuple[bytes, bool]:
+        """
+        Read a pipe to EOF, keeping at most `max_output_bytes`.
+
+        Output past the limit is read and discarded rather than left in the
+        pipe, so the child never blocks on a full pipe. The cut never splits a
+        UTF-8 character. Returns the kept bytes and whether anything was dropped.
+        """
+        if stream is None:
+            return b"", False
+
+        limit = self.max_output_bytes
+        buf = bytearray()
+        truncated = False
+        while chunk := await stream.read(_READ_CHUNK_SIZE):
+            if truncated:
+                continue
+            if limit is None or len(buf) + len(chunk) <= limit:
+                buf += chunk
+                continue
+
+            # Keep one byte past the limit so the cut can be moved back to a
+            # character boundary instead of leaving a replacement character.
+            buf += chunk[: limit - len(buf) + 1]
+            del buf[_utf8_boundary(buf, limit):]
+            truncated = True
+        return bytes(buf), truncated
+
     def _build_command(self, command: str) -> list[str]:
         allow_net = self.network != NetworkMode.BLOCKED
 
+        prefix = self._prefixes.get(allow_net)
+        if prefix is None:
+            prefix = self._prefixes[allow_net] = self._build_prefix(allow_net)
+        return [*prefix, command]
+
+    def _build_prefix(self, allow_net: bool) -> list[str]:
+        """
+        Build the isolation wrapper placed before the command string.
+        It only depends on the sandbox config, so it is built once per network
+        setting rather than on every execute (Seatbelt regenerates its profile).
+        """
+        # Both builders return [..., "bash", "-c", command]
         if self._mechanism == KernelIsolation.SEATBELT:
             profile = SeatbeltProfile(self.cwd, allow_network=allow_net)
-            return build_seatbelt(command, profile)
+            return build_seatbelt("", profile)[:-1]
 
         elif self._mechanism == KernelIsolation.LANDLOCK:
-            return build_landlock(command, self.cwd, allow_network=allow_net)
+            return build_landlock("", self.cwd, allow_network=allow_net)[:-1]
 
-        return ["bash", "-c", command]
+        return ["bash", "-c"]
 
     async def close(self) -> None:
         self._closed = True
@@ -8,7 +8,7 @@ command with dynamically generated Seatbelt profiles in SBPL (Scheme).
 from __future__ import annotations
 
 import os
-import subprocess
+import shutil
 import tempfile
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -42,7 +42,7 @@ MANDATORY_DENY_WRITE_SUBPATHS: tuple[str, ...] = (
     ".cursor",
 )
 
-@dataclass
+@dataclass(slots=True)
 class SeatbeltProfile:
     """
     Configuration for generating a macOS Seatbelt (sandbox-exec) profile.
@@ -228,16 +228,8 @@ def is_seatbelt_available() -> bool:
     if platform.system() != "Darwin":
         return False
 
-    try:
-        result = subprocess.run(
-            ["which", "sandbox-exec"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        return result.returncode == 0
-    except (subprocess.SubprocessError, FileNotFoundError):
-        return False
+    # Resolve against $PATH in-process instead of forking `which`.
+    return shutil.which("sandbox-exec") is not None
 
 
 def build_sandboxed_command(
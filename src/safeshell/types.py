@@ -4,10 +4,15 @@ Core types and data models for safeshell.
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from enum import Enum
 
 from pydantic import BaseModel, Field
 
+# Trie node keyed by domain label; the ``None`` key marks the end of an
+# allowed domain.
+_TrieNode = dict[str | None, "_TrieNode"]
+
 
 class CommandResult(BaseModel):
     """Result of a command execution."""
@@ -16,6 +21,7 @@ class CommandResult(BaseModel):
     stderr: str = Field(description="Standard error output.")
     exit_code: int = Field(description="Exit status code (0 = success).")
     timed_out: bool = Field(default=False, description="Whether execution deadline was exceeded.")
+    truncated: bool = Field(default=False, description="Whether output was cut at the sandbox's max_output_bytes.")
 
     @property
     def is_success(self) -> bool:
@@ -33,6 +39,50 @@ class NetworkMode(str, Enum):
     """Allow access only to specific domains."""
 
 
+class CompiledAllowlist:
+    """
+    Read-only snapshot of a NetworkAllowlist, optimised for repeated lookups.
+
+    Exact hits are a single set probe. Subdomains are resolved through a trie
+    of reversed labels ("files.pypi.org" becomes org -> pypi -> files), so a
+    lookup costs one dict probe per label of the queried host, independent of
+    how many domains are allowed. Matching is case-insensitive.
+    """
+
+    __slots__ = ("_exact", "_ports", "_root")
+
+    def __init__(self, domains: Iterable[str], ports: Iterable[int]) -> None:
+        # Hostnames are case-insensitive; normalise once here, not per lookup
+        self._exact = frozenset(domain.lower() for domain in domains)
+        self._ports = frozenset(ports)
+        self._root: _TrieNode = {}
+        for domain in self._exact:
+            node = self._root
+            for label in reversed(domain.split(".")):
+                node = node.setdefault(label, {})
+            node[None] = {}
+
+    def is_allowed(self, host: str, port: int) -> bool:
+        """Same semantics as NetworkAllowlist.is_allowed."""
+        if port not in self._ports:
+            return False
+
+        host = host.lower()
+        if host in self._exact:
+            return True
+
+        node = self._root
+        for label in reversed(host.split(".")):
+            child = node.get(label)
+            if child is None:
+                return False
+            if None in child:
+                # An allowed domain ends here: host is it or a subdomain of it
+                return True
+            node = child
+        return False
+
+
 class NetworkAllowlist(BaseModel):
     """Configuration for allowlisted network domains and ports."""
 
@@ -42,16 +92,27 @@ class NetworkAllowlist(BaseModel):
     def is_allowed(self, host: str, port: int) -> bool:
         """
         Check if the given host and port are allowed.
-        Matches exact domains or subdomains (e.g., 'pypi.org' matches 'files.pypi.org').
+        Matches exact domains or subdomains (e.g., 'pypi.org' matches 'files.pypi.org'),
+        ignoring case.
         """
         if port not in self.allow_ports:
             return False
 
-        # Check for exact match or subdomain match
-        return any(
-            host == domain or host.endswith(f".{domain}")
-            for domain in self.domains
-        )
+        # Check for exact match or subdomain match. One-off checks scan the
+        # domains directly; repeated lookups should hold a compile() snapshot.
+        host = host.lower()
+        for domain in self.domains:
+            domain = domain.lower()
+            if host == domain or host.endswith(f".{domain}"):
+                return True
+        return False
+
+    def compile(self) -> CompiledAllowlist:
+        """
+        Snapshot the allowlist for fast repeated lookups.
+        Later changes to `domains` or `allow_ports` do not affect the snapshot.
+        """
+        return CompiledAllowlist(self.domains, self.allow_ports)
 
     @classmethod
     def development(cls) -> NetworkAllowlist:
@@ -1,9 +1,26 @@
 """Tests for framework integrations."""
 
+import asyncio
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+
 import pytest
 
 from safeshell import NetworkMode
 
+
+def test_integrations_package_is_lazy():
+    """Importing the integrations package must not import any framework."""
+    code = (
+        "import sys, safeshell.integrations; "
+        "assert 'langchain_core' not in sys.modules; "
+        "assert 'pydantic_ai' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
 # LangChain Tests
 
 def test_langchain_import_error():
@@ -38,6 +55,29 @@ async def test_langchain_tool():
     assert "Exit Code 1" in result
 
 
+def test_langchain_tool_sync():
+    """Test LangChain ShellTool from synchronous code."""
+    try:
+        from safeshell.integrations.langchain import ShellTool
+    except ImportError:
+        pytest.skip("langchain-core not installed")
+
+    from safeshell.integrations import langchain
+
+    tool = ShellTool(cwd=".", network=NetworkMode.BLOCKED)
+
+    # Repeated calls share the same background loop
+    assert tool.run("echo one").strip() == "one"
+    loop = langchain._get_loop()
+    assert tool.run("echo two").strip() == "two"
+    assert langchain._get_loop() is loop
+    assert loop.is_running()
+
+    threads = [t for t in threading.enumerate() if t.name == "safeshell-langchain"]
+    assert len(threads) == 1
+    assert threads[0].is_alive()
+
+
 # PydanticAI Tests
 
 @pytest.mark.asyncio
@@ -45,8 +85,6 @@ async def test_pydantic_ai_tool():
     """Test PydanticAI tool creation."""
     try:
         # We need to mock RunContext as it's required by the tool signature
-        from dataclasses import dataclass
-
         from safeshell.integrations.pydantic_ai import create_shell_tool
         @dataclass
         class MockContext:
@@ -61,3 +99,54 @@ async def test_pydantic_ai_tool():
     ctx = MockContext(deps={})
     result = await tool_fn(ctx, "echo pydantic")
     assert result.strip() == "pydantic"
+
+
+def _counting_sandbox(monkeypatch: pytest.MonkeyPatch) -> list[object]:
+    """Patch the pydantic_ai integration to record every Sandbox it builds."""
+    from safeshell.integrations import pydantic_ai
+
+    built: list[object] = []
+    real = pydantic_ai.Sandbox
+
+    def counting(*args, **kwargs):
+        sb = real(*args, **kwargs)
+        built.append(sb)
+        return sb
+
+    monkeypatch.setattr(pydantic_ai, "Sandbox", counting)
+    return built
+
+
+@pytest.mark.asyncio
+async def test_pydantic_ai_tool_pool(monkeypatch):
+    """Concurrent calls beyond the pool size wait for a free sandbox."""
+    try:
+        from safeshell.integrations.pydantic_ai import create_shell_tool
+    except ImportError:
+        pytest.skip("pydantic-ai not installed")
+
+    built = _counting_sandbox(monkeypatch)
+    tool_fn = create_shell_tool(cwd=".", network=NetworkMode.BLOCKED, pool_size=2)
+
+    results = await asyncio.gather(*(tool_fn(None, f"echo {i}") for i in range(5)))
+    assert [r.strip() for r in results] == [str(i) for i in range(5)]
+    assert 1 <= len(built) <= 2
+
+
+def test_pydantic_ai_tool_pool_across_loops(monkeypatch):
+    """A tool keeps working, and reusing its sandboxes, across asyncio.run calls."""
+    try:
+        from safeshell.integrations.pydantic_ai import create_shell_tool
+    except ImportError:
+        pytest.skip("pydantic-ai not installed")
+
+    built = _counting_sandbox(monkeypatch)
+    tool_fn = create_shell_tool(cwd=".", network=NetworkMode.BLOCKED, pool_size=1)
+
+    async def contend() -> list[str]:
+        return await asyncio.gather(tool_fn(None, "echo a"), tool_fn(None, "echo b"))
+
+    for _ in range(2):
+        results = asyncio.run(contend())
+        assert [r.strip() for r in results] == ["a", "b"]
+    assert len(built) == 1
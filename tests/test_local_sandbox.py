@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 import pytest
 
 from safeshell import NativeSandbox as LocalSandbox
 from safeshell import NetworkMode
+from safeshell.errors import ExecutionError
+from safeshell.sandbox.native import _detect_kernel_isolation
 
 # NOTE: We aliased NativeSandbox as LocalSandbox to minimize test churn
 # while validating the refactor logic.
@@ -35,6 +39,47 @@ class TestLocalSandbox:
         assert result.exit_code == -1
 
 
+class TestOutputLimits:
+    """Output capping tests."""
+
+    async def test_output_is_capped(self, temp_dir: Path) -> None:
+        async with LocalSandbox(cwd=temp_dir, max_output_bytes=100) as capped:
+            result = await capped.execute("head -c 1000000 /dev/zero | tr '\\0' a")
+
+        assert result.exit_code == 0
+        assert result.stdout == "a" * 100
+        assert result.truncated
+
+    async def test_cap_does_not_split_characters(self, temp_dir: Path) -> None:
+        async with LocalSandbox(cwd=temp_dir, max_output_bytes=101) as capped:
+            result = await capped.execute("python3 -c \"print('é' * 100, end='')\"")
+
+        assert result.stdout == "é" * 50
+        assert result.truncated
+
+    async def test_output_under_cap_is_untouched(self, temp_dir: Path) -> None:
+        async with LocalSandbox(cwd=temp_dir, max_output_bytes=100) as capped:
+            result = await capped.execute("echo hello; echo oops >&2")
+
+        assert result.stdout == "hello\n"
+        assert result.stderr == "oops\n"
+        assert not result.truncated
+
+    async def test_uncapped_by_default(self, sandbox: LocalSandbox) -> None:
+        result = await sandbox.execute("head -c 300000 /dev/zero")
+        assert len(result.stdout) == 300000
+        assert not result.truncated
+
+
+class TestKernelIsolationDetection:
+    """Backend detection tests."""
+
+    async def test_detection_probe_runs_once(self, sandbox: LocalSandbox) -> None:
+        other = LocalSandbox(cwd=sandbox.cwd)
+        assert other._mechanism is sandbox._mechanism
+        assert _detect_kernel_isolation.cache_info().misses == 1
+
+
 class TestIsolation:
     """Tests for OS-level isolation."""
 
@@ -90,6 +135,5 @@ class TestLifecycle:
         await sandbox.close()
         # Expect ExecutionError (subclass of SafeShellError) or RuntimeError depending on impl.
         # New impl raises ExecutionError.
-        from safeshell.errors import ExecutionError
         with pytest.raises(ExecutionError, match="closed"):
             await sandbox.execute("echo test")
@@ -0,0 +1,248 @@
+"""Tests for network allowlisting and the allowlist proxy."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+from safeshell import NetworkAllowlist, networking
+from safeshell.networking import AllowlistProxy
+
+
+async def _echo(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    while data := await reader.read(65536):
+        writer.write(data)
+        await writer.drain()
+    writer.close()
+
+
+@pytest_asyncio.fixture
+async def echo_port() -> AsyncGenerator[int, None]:
+    """Start a local TCP echo server to tunnel to."""
+    server = await asyncio.start_server(_echo, "127.0.0.1", 0)
+    async with server:
+        yield server.sockets[0].getsockname()[1]
+
+
+async def _connect(
+    proxy_port: int, target_port: int
+) -> tuple[bytes, asyncio.StreamReader, asyncio.StreamWriter]:
+    """Open a CONNECT tunnel through the proxy and return its response head."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", proxy_port)
+    target = f"127.0.0.1:{target_port}"
+    writer.write(f"CONNECT {target} HTTP/1.1\r\nHost: {target}\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    return head, reader, writer
+
+
+class TestNetworkAllowlist:
+    """Domain and port matching."""
+
+    def test_exact_domain_allowed(self) -> None:
+        allowlist = NetworkAllowlist(domains={"pypi.org"})
+        assert allowlist.is_allowed("pypi.org", 443)
+
+    def test_subdomain_allowed(self) -> None:
+        allowlist = NetworkAllowlist(domains={"pypi.org"})
+        assert allowlist.is_allowed("files.pypi.org", 443)
+        assert allowlist.is_allowed("a.b.pypi.org", 80)
+
+    def test_suffix_without_label_boundary_blocked(self) -> None:
+        allowlist = NetworkAllowlist(domains={"pypi.org"})
+        assert not allowlist.is_allowed("evilpypi.org", 443)
+        assert not allowlist.is_allowed("org", 443)
+        assert not allowlist.is_allowed("pypi.org.evil.com", 443)
+
+    def test_matching_ignores_case(self) -> None:
+        allowlist = NetworkAllowlist(domains={"GitHub.com"})
+        assert allowlist.is_allowed("github.com", 443)
+        assert allowlist.is_allowed("API.GITHUB.COM", 443)
+
+    def test_port_must_be_allowed(self) -> None:
+        allowlist = NetworkAllowlist(domains={"pypi.org"})
+        assert not allowlist.is_allowed("pypi.org", 22)
+
+    def test_parent_and_child_domains(self) -> None:
+        allowlist = NetworkAllowlist(domains={"files.pythonhosted.org", "github.com"})
+        assert allowlist.is_allowed("files.pythonhosted.org", 443)
+        assert not allowlist.is_allowed("pythonhosted.org", 443)
+        assert allowlist.is_allowed("api.github.com", 443)
+
+    def test_compile_is_a_snapshot(self) -> None:
+        allowlist = NetworkAllowlist(domains={"pypi.org"})
+        compiled = allowlist.compile()
+        allowlist.domains.discard("pypi.org")
+
+        assert compiled.is_allowed("pypi.org", 443)
+        assert not allowlist.is_allowed("pypi.org", 443)
+
+    def test_lookup_sees_in_place_edits(self) -> None:
+        allowlist = NetworkAllowlist(domains={"pypi.org"})
+        assert not allowlist.is_allowed("github.com", 443)
+
+        allowlist.domains.add("github.com")
+        allowlist.allow_ports.add(22)
+        assert allowlist.is_allowed("github.com", 22)
+
+    def test_lookup_keeps_model_equality(self) -> None:
+        allowlist, other = NetworkAllowlist.development(), NetworkAllowlist.development()
+        allowlist.is_allowed("pypi.org", 443)
+        AllowlistProxy(allowlist)
+        assert allowlist == other
+
+
+class TestAllowlistProxy:
+    """End-to-end CONNECT tunnelling."""
+
+    @pytest.mark.parametrize("splice", [True, False], ids=["splice", "copy"])
+    async def test_tunnel_round_trip(
+        self, echo_port: int, splice: bool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        if splice and not networking._HAS_SPLICE:
+            pytest.skip("os.splice() not available on this platform")
+        monkeypatch.setattr(networking, "_HAS_SPLICE", splice)
+
+        allowlist = NetworkAllowlist(domains={"127.0.0.1"}, allow_ports={echo_port})
+        proxy = AllowlistProxy(allowlist)
+        proxy_port = await proxy.start()
+        try:
+            head, reader, writer = await _connect(proxy_port, echo_port)
+            assert head.startswith(b"HTTP/1.1 200")
+
+            payload = os.urandom(1 << 20)
+
+            async def send() -> None:
+                writer.write(payload)
+                await writer.drain()
+
+            _, echoed = await asyncio.gather(send(), reader.readexactly(len(payload)))
+            assert echoed == payload
+
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            await proxy.stop()
+
+    async def test_client_socket_closed_if_remote_handoff_fails(
+        self, echo_port: int, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        taken: list[socket.socket] = []
+        real_take = networking._take_socket
+
+        def take_once(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> tuple[socket.socket, bytes]:
+            if taken:
+                raise OSError("remote transport already closed")
+            sock, pending = real_take(reader, writer)
+            taken.append(sock)
+            return sock, pending
+
+        monkeypatch.setattr(networking, "_take_socket", take_once)
+
+        allowlist = NetworkAllowlist(domains={"127.0.0.1"}, allow_ports={echo_port})
+        proxy = AllowlistProxy(allowlist)
+        proxy_port = await proxy.start()
+        try:
+            head, reader, writer = await _connect(proxy_port, echo_port)
+            assert head.startswith(b"HTTP/1.1 200")
+            assert await asyncio.wait_for(reader.read(), 2.0) == b""
+            writer.close()
+        finally:
+            await proxy.stop()
+
+        assert len(taken) == 1
+        assert taken[0].fileno() == -1
+
+    async def test_forbidden_target(self, echo_port: int) -> None:
+        proxy = AllowlistProxy(NetworkAllowlist(domains={"pypi.org"}))
+        proxy_port = await proxy.start()
+        try:
+            head, _, writer = await _connect(proxy_port, echo_port)
+            assert head.startswith(b"HTTP/1.1 403")
+            writer.close()
+        finally:
+            await proxy.stop()
+
+    @pytest.mark.parametrize("splice", [True, False], ids=["splice", "copy"])
+    async def test_half_close_keeps_reply_direction(
+        self, splice: bool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        if splice and not networking._HAS_SPLICE:
+            pytest.skip("os.splice() not available on this platform")
+        monkeypatch.setattr(networking, "_HAS_SPLICE", splice)
+
+        async def reply_after_eof(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            request = await reader.read()
+            await asyncio.sleep(0.1)
+            writer.write(b"got " + request)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(reply_after_eof, "127.0.0.1", 0)
+        async with server:
+            server_port = server.sockets[0].getsockname()[1]
+            allowlist = NetworkAllowlist(domains={"127.0.0.1"}, allow_ports={server_port})
+            proxy = AllowlistProxy(allowlist)
+            proxy_port = await proxy.start()
+            try:
+                head, reader, writer = await _connect(proxy_port, server_port)
+                assert head.startswith(b"HTTP/1.1 200")
+
+                writer.write(b"hello")
+                writer.write_eof()
+                assert await asyncio.wait_for(reader.read(), 2.0) == b"got hello"
+                writer.close()
+            finally:
+                await proxy.stop()
+
+    async def test_bytes_after_head_reach_tunnel(self, echo_port: int) -> None:
+        allowlist = NetworkAllowlist(domains={"127.0.0.1"}, allow_ports={echo_port})
+        proxy = AllowlistProxy(allowlist)
+        proxy_port = await proxy.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", proxy_port)
+            target = f"127.0.0.1:{echo_port}"
+            writer.write(f"CONNECT {target} HTTP/1.1\r\nHost: {target}\r\n\r\nhello".encode())
+            await writer.drain()
+
+            head = await reader.readuntil(b"\r\n\r\n")
+            assert head.startswith(b"HTTP/1.1 200")
+            assert await reader.readexactly(5) == b"hello"
+            writer.close()
+        finally:
+            await proxy.stop()
+
+    async def test_lf_only_head_is_parsed(self) -> None:
+        proxy = AllowlistProxy(NetworkAllowlist(domains={"pypi.org"}))
+        proxy_port = await proxy.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", proxy_port)
+            writer.write(b"CONNECT evil.com:443 HTTP/1.1\nHost: evil.com\n\n")
+            await writer.drain()
+
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 2.0)
+            assert head.startswith(b"HTTP/1.1 403")
+            writer.close()
+        finally:
+            await proxy.stop()
+
+    async def test_oversized_head_rejected(self) -> None:
+        proxy = AllowlistProxy(NetworkAllowlist(domains={"pypi.org"}))
+        proxy_port = await proxy.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", proxy_port)
+            writer.write(b"CONNECT pypi.org:443 HTTP/1.1\r\nX-Pad: " + b"a" * (1 << 17))
+            await writer.drain()
+
+            head = await reader.readuntil(b"\r\n\r\n")
+            assert head.startswith(b"HTTP/1.1 400")
+            writer.close()
+        finally:
+            await proxy.stop()